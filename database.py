@@ -5,13 +5,16 @@ MongoDB helper functions ready to use in your backend code.
 Import and use these functions in your API endpoints for database operations.
 """
 
-from pymongo import MongoClient
+from motor.motor_asyncio import AsyncIOMotorClient
 from datetime import datetime, timezone
 import os
+from functools import lru_cache
 from dotenv import load_dotenv
-from typing import Union, Optional, Dict, Any
+from typing import Union, Optional, Dict, Any, List, Iterable
 from pydantic import BaseModel
 from bson import ObjectId
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
 
 # Load environment variables from .env file
 load_dotenv()
@@ -23,11 +26,42 @@ database_url = os.getenv("DATABASE_URL")
 database_name = os.getenv("DATABASE_NAME")
 
 if database_url and database_name:
-    _client = MongoClient(database_url)
+    # One client (and connection pool) per process, shared by every request
+    _client = AsyncIOMotorClient(
+        database_url,
+        maxPoolSize=int(os.getenv("MONGO_MAX_POOL_SIZE", "200")),
+        minPoolSize=int(os.getenv("MONGO_MIN_POOL_SIZE", "10")),
+        waitQueueTimeoutMS=int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", "2000")),
+        serverSelectionTimeoutMS=int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "3000")),
+        compressors=os.getenv("MONGO_COMPRESSORS", "zstd,zlib"),
+    )
     db = _client[database_name]
 
+@lru_cache(maxsize=None)
+def _coll(collection_name: str):
+    """Collection handle, built once per name"""
+    return db[collection_name]
+
+def _with_str_id(doc: dict):
+    """Replace the ObjectId _id with its hex string under "id" """
+    oid = doc.pop("_id", None)
+    if oid is not None:
+        # ObjectId.binary.hex() skips the temporary str(ObjectId) builds
+        doc["id"] = oid.binary.hex() if isinstance(oid, ObjectId) else str(oid)
+    return doc
+
+def get_collection(collection_name: str):
+    """Shared collection handle for operations the helpers below don't cover"""
+    if db is None:
+        raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
+    return _coll(collection_name)
+
+async def _iter_with_str_id(cursor):
+    async for doc in cursor:
+        yield _with_str_id(doc)
+
 # Helper functions for common database operations
-def create_document(collection_name: str, data: Union[BaseModel, dict]):
+async def create_document(collection_name: str, data: Union[BaseModel, dict]):
     """Insert a single document with timestamp"""
     if db is None:
         raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
@@ -41,21 +75,53 @@ def create_document(collection_name: str, data: Union[BaseModel, dict]):
     data_dict['created_at'] = datetime.now(timezone.utc)
     data_dict['updated_at'] = datetime.now(timezone.utc)
 
-    result = db[collection_name].insert_one(data_dict)
+    result = await _coll(collection_name).insert_one(data_dict)
     return str(result.inserted_id)
 
-def get_documents(collection_name: str, filter_dict: dict = None, limit: int = None):
-    """Get documents from collection"""
+async def get_documents(collection_name: str, filter_dict: dict = None, limit: int = None, projection: dict = None):
+    """Get documents from collection, optionally restricted to a projection"""
     if db is None:
         raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
     
-    cursor = db[collection_name].find(filter_dict or {})
+    cursor = _coll(collection_name).find(filter_dict or {}, projection)
     if limit:
         cursor = cursor.limit(limit)
     
-    return list(cursor)
+    return [_with_str_id(doc) for doc in await cursor.to_list(length=limit)]
+
+def find_documents(collection_name: str, filter_dict: dict = None):
+    """Iterate matching documents asynchronously without materializing a list"""
+    if db is None:
+        raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
+    return _iter_with_str_id(_coll(collection_name).find(filter_dict or {}))
+
+async def upsert_documents(collection_name: str, items: List[dict], key_fields: Iterable[str]):
+    """Insert documents missing by key fields in a single bulk round-trip"""
+    if db is None:
+        raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
+    if not items:
+        return 0
+    key_fields = tuple(key_fields)
+    now = datetime.now(timezone.utc)
+    ops = [
+        UpdateOne(
+            {k: item.get(k) for k in key_fields},
+            {"$setOnInsert": {**item, "created_at": now, "updated_at": now}},
+            upsert=True,
+        )
+        for item in items
+    ]
+    try:
+        res = await _coll(collection_name).bulk_write(ops, ordered=False)
+    except BulkWriteError as e:
+        # A concurrent upsert inserted the same key first; the document now
+        # exists, which is all this helper promises. Anything else re-raises.
+        if any(err.get("code") != 11000 for err in e.details.get("writeErrors", [])) or e.details.get("writeConcernErrors"):
+            raise
+        return e.details.get("nUpserted", 0)
+    return res.upserted_count
 
-def update_document(collection_name: str, doc_id: str, data: Dict[str, Any]):
+async def update_document(collection_name: str, doc_id: str, data: Dict[str, Any]):
     """Update a document by id"""
     if db is None:
         raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
@@ -65,10 +131,10 @@ def update_document(collection_name: str, doc_id: str, data: Dict[str, Any]):
         raise ValueError("Invalid document id")
     data = {k: v for k, v in data.items() if k != "_id" and v is not None}
     data['updated_at'] = datetime.now(timezone.utc)
-    res = db[collection_name].update_one({"_id": oid}, {"$set": data})
+    res = await _coll(collection_name).update_one({"_id": oid}, {"$set": data})
     return res.modified_count > 0
 
-def delete_document(collection_name: str, doc_id: str):
+async def delete_document(collection_name: str, doc_id: str):
     """Delete a document by id"""
     if db is None:
         raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
@@ -76,5 +142,5 @@ def delete_document(collection_name: str, doc_id: str):
         oid = ObjectId(doc_id)
     except Exception:
         raise ValueError("Invalid document id")
-    res = db[collection_name].delete_one({"_id": oid})
+    res = await _coll(collection_name).delete_one({"_id": oid})
     return res.deleted_count > 0
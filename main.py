@@ -1,15 +1,22 @@
 import os
 import uuid
-from datetime import datetime, timedelta
+import asyncio
+from datetime import datetime, timedelta, timezone
 from typing import List, Optional, Dict, Any
 
 from fastapi import FastAPI, HTTPException, Depends, Request, UploadFile, File
-from fastapi.middleware.cors import CORSMiddleware
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, TypeAdapter, ValidationError
 from passlib.hash import pbkdf2_sha256
+from cachetools import TTLCache
+from pymongo.errors import DuplicateKeyError
+import orjson
+import jwt
+from bson import ObjectId
 
-from database import db, create_document, get_documents, update_document, delete_document
+from database import db, get_collection, create_document, get_documents, find_documents, update_document, delete_document, upsert_documents
 
 # Email deps (stdlib)
 import smtplib
@@ -19,64 +26,218 @@ from email.message import EmailMessage
 UPLOAD_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), 'uploads'))
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
-app = FastAPI()
+# orjson serializes dicts/datetimes natively and much faster than json.dumps
+app = FastAPI(default_response_class=ORJSONResponse)
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+
+class AllowAllCORSMiddleware:
+    """
+    Pure-ASGI equivalent of CORSMiddleware(allow_origins=["*"], allow_credentials=True,
+    allow_methods=["*"], allow_headers=["*"]). With every origin allowed there is
+    nothing to match, so headers are prebuilt and preflights answered directly.
+    """
+
+    _SIMPLE_HEADERS = [
+        (b"access-control-allow-origin", b"*"),
+        (b"access-control-allow-credentials", b"true"),
+    ]
+    _PREFLIGHT_HEADERS = [
+        (b"access-control-allow-methods", b"DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT"),
+        (b"access-control-allow-credentials", b"true"),
+        (b"access-control-max-age", b"600"),
+        (b"vary", b"Origin"),
+        (b"content-type", b"text/plain; charset=utf-8"),
+        (b"content-length", b"2"),
+    ]
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        origin = request_method = request_headers = None
+        has_cookie = False
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                origin = value
+            elif name == b"access-control-request-method":
+                request_method = value
+            elif name == b"access-control-request-headers":
+                request_headers = value
+            elif name == b"cookie":
+                has_cookie = True
+
+        if origin is None:
+            await self.app(scope, receive, send)
+            return
+
+        if scope["method"] == "OPTIONS" and request_method is not None:
+            # Credentialed preflights must echo the origin rather than "*"
+            headers = [(b"access-control-allow-origin", origin), *self._PREFLIGHT_HEADERS]
+            if request_headers is not None:
+                headers.append((b"access-control-allow-headers", request_headers))
+            await send({"type": "http.response.start", "status": 200, "headers": headers})
+            await send({"type": "http.response.body", "body": b"OK"})
+            return
+
+        if has_cookie:
+            cors_headers = [
+                (b"access-control-allow-origin", origin),
+                (b"access-control-allow-credentials", b"true"),
+            ]
+        else:
+            cors_headers = self._SIMPLE_HEADERS
+
+        async def send_with_cors(message):
+            if message["type"] == "http.response.start":
+                # Replace rather than duplicate any CORS headers set downstream,
+                # and merge Origin into an existing Vary like MutableHeaders does
+                headers = []
+                vary = None
+                for name, value in message.get("headers", ()):
+                    lname = name.lower()
+                    if lname.startswith(b"access-control-allow-"):
+                        continue
+                    if lname == b"vary":
+                        vary = value if vary is None else vary + b", " + value
+                        continue
+                    headers.append((name, value))
+                if has_cookie:
+                    vary = b"Origin" if vary is None else vary + b", Origin"
+                if vary is not None:
+                    headers.append((b"vary", vary))
+                headers.extend(cors_headers)
+                message["headers"] = headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
+
+
+app.add_middleware(AllowAllCORSMiddleware)
 
 # Serve uploaded media securely via static mount (read-only)
 app.mount("/media", StaticFiles(directory=UPLOAD_DIR), name="media")
 
+# Constant bodies encoded once at import; no encoder runs per request
+_ROOT_BODY = orjson.dumps({"message": "Hello from FastAPI Backend!"})
+_HELLO_BODY = orjson.dumps({"message": "Hello from the backend API!"})
+
 @app.get("/")
-def read_root():
-    return {"message": "Hello from FastAPI Backend!"}
+async def read_root():
+    return Response(content=_ROOT_BODY, media_type="application/json")
 
 @app.get("/api/hello")
-def hello():
-    return {"message": "Hello from the backend API!"}
+async def hello():
+    return Response(content=_HELLO_BODY, media_type="application/json")
 
 # ---------------- Startup Bootstrap ----------------
 
 @app.on_event("startup")
-def bootstrap_admin():
+async def bootstrap_admin():
     # Ensure upload dir exists
     os.makedirs(UPLOAD_DIR, exist_ok=True)
     try:
         email = os.getenv("ADMIN_EMAIL")
         if not email:
             return
-        docs = get_documents("user", {"email": email}, limit=1)
-        if not docs:
-            return
-        user_id = docs[0]["_id"]
-        update_document("user", user_id, {"is_admin": True, "is_verified": True})
+        # Single round-trip: no-op if the admin account does not exist yet
+        await get_collection("user").update_one({"email": email}, {"$set": {"is_admin": True, "is_verified": True}})
     except Exception:
         # Silently continue to avoid blocking server start
         pass
 
+
+# (collection, keys, options) for every field the list/auth endpoints filter on
+INDEXES = [
+    ("user", "email", {"unique": True}),
+    ("client", "category_key", {}),
+    ("project", "client_name", {}),
+    ("testimonial", [("status", 1), ("company", 1)], {}),
+    ("setting", "key", {"unique": True}),
+    ("revoked_token", "jti", {"unique": True}),
+    ("revoked_token", "exp", {"expireAfterSeconds": 0}),  # purge once the token expires
+]
+
+@app.on_event("startup")
+async def ensure_indexes():
+    if db is None:
+        return
+    for collection, keys, options in INDEXES:
+        try:
+            await get_collection(collection).create_index(keys, **options)
+        except Exception:
+            # e.g. pre-existing duplicates; never block server start
+            pass
+
 # ---------------- Helpers ----------------
 
-def serialize(doc):
-    if not doc:
-        return doc
-    d = dict(doc)
-    if "_id" in d:
-        d["id"] = str(d.pop("_id"))
-    return d
-
-# Simple session-based auth using DB-backed tokens
-class AuthSession(BaseModel):
-    token: str
-    user_id: str
-    is_admin: bool
-    is_verified: bool
-    created_at: datetime
-    expires_at: datetime
+# Flush the encoded array in pieces of about this size rather than per document
+_STREAM_CHUNK_BYTES = 64 * 1024
+
+
+async def _json_array_stream(first_doc, docs):
+    # Encode documents as the cursor yields them instead of building the full list
+    buf = bytearray(b"[")
+    if first_doc is not None:
+        buf += orjson.dumps(first_doc)
+        async for doc in docs:
+            buf += b","
+            buf += orjson.dumps(doc)
+            if len(buf) >= _STREAM_CHUNK_BYTES:
+                yield bytes(buf)
+                buf.clear()
+    buf += b"]"
+    yield bytes(buf)
+
+
+async def stream_documents(collection_name: str, filter_dict: dict = None) -> StreamingResponse:
+    docs = find_documents(collection_name, filter_dict)
+    # The cursor is lazy and the 200 is sent before the body is pulled, so fetch
+    # the first batch here: connection/query errors still surface as a 500.
+    try:
+        first_doc = await docs.__anext__()
+    except StopAsyncIteration:
+        first_doc = None
+    return StreamingResponse(_json_array_stream(first_doc, docs), media_type="application/json")
+
+# Signed JWTs carry the user id, a unique jti and exp. Roles are read from the
+# user record (via the 60s cache below), and logout revokes a token by adding
+# its jti to the revoked_token collection until the token would have expired.
+# The secret must be shared by all workers, so there is no random fallback.
+JWT_SECRET = os.getenv("JWT_SECRET")
+JWT_ALGORITHM = "HS256"
+TOKEN_TTL = timedelta(days=7)
+
+# Keeps password hashes on the server for every read that does not verify one
+NO_PASSWORD_HASH = {"password_hash": 0}
+
+# token -> user dict; saves the user lookup on every authenticated request.
+# Entries are evicted on logout/role changes.
+_SESSION_CACHE: TTLCache = TTLCache(maxsize=10_000, ttl=60)
+
+
+def _invalidate_user_sessions(user_id: str):
+    for tok, cached_user in list(_SESSION_CACHE.items()):
+        if cached_user.get("id") == user_id:
+            _SESSION_CACHE.pop(tok, None)
+
+
+def _require_jwt_secret() -> str:
+    if not JWT_SECRET:
+        raise HTTPException(status_code=500, detail="Auth not configured. Set JWT_SECRET environment variable.")
+    return JWT_SECRET
+
+
+def _issue_token(user: Dict[str, Any]) -> str:
+    claims = {
+        "sub": user["id"],
+        "jti": uuid.uuid4().hex,
+        "exp": int((datetime.now(timezone.utc) + TOKEN_TTL).timestamp()),
+    }
+    return jwt.encode(claims, _require_jwt_secret(), algorithm=JWT_ALGORITHM)
 
 
 def _get_token_from_request(request: Request) -> Optional[str]:
@@ -89,34 +250,50 @@ def _get_token_from_request(request: Request) -> Optional[str]:
     return None
 
 
-def get_current_user(request: Request):
+def get_token_claims(request: Request) -> Dict[str, Any]:
+    """Verify the bearer token and return its claims without touching the database"""
     token = _get_token_from_request(request)
     if not token:
         raise HTTPException(status_code=401, detail="Missing token")
-    sess_docs = get_documents("session", {"token": token}, limit=1)
-    if not sess_docs:
+    try:
+        return jwt.decode(
+            token,
+            _require_jwt_secret(),
+            algorithms=[JWT_ALGORITHM],
+            options={"require": ["sub", "jti", "exp"]},
+        )
+    except jwt.ExpiredSignatureError:
+        raise HTTPException(status_code=401, detail="Session expired")
+    except jwt.InvalidTokenError:
         raise HTTPException(status_code=401, detail="Invalid token")
-    sess = serialize(sess_docs[0])
-    # Check expiry
+
+
+async def get_current_user(request: Request):
+    claims = get_token_claims(request)
+    token = _get_token_from_request(request)
+    cached = _SESSION_CACHE.get(token)
+    if cached is not None:
+        return dict(cached)
+    # Load the user so role changes apply without waiting for token expiry
     try:
-        if sess.get("expires_at") and datetime.fromisoformat(str(sess["expires_at"])) < datetime.utcnow():
-            raise HTTPException(status_code=401, detail="Session expired")
+        oid = ObjectId(claims.get("sub"))
     except Exception:
-        pass
-    # Load user
-    user_docs = get_documents("user", {"_id": sess_docs[0]["user_id"]}, limit=1) if "user_id" in sess_docs[0] else []
-    # Fallback by id string
-    if not user_docs:
-        user_docs = get_documents("user", {"_id": sess.get("user_id")}, limit=1)
+        raise HTTPException(status_code=401, detail="Invalid token")
+    user_docs, revoked = await asyncio.gather(
+        get_documents("user", {"_id": oid}, limit=1, projection=NO_PASSWORD_HASH),
+        get_documents("revoked_token", {"jti": claims["jti"]}, limit=1, projection={"_id": 1}),
+    )
+    if revoked:
+        raise HTTPException(status_code=401, detail="Token revoked")
     if not user_docs:
         raise HTTPException(status_code=401, detail="User not found")
-    user = serialize(user_docs[0])
-    user.pop("password_hash", None)
-    return user
+    user = user_docs[0]
+    _SESSION_CACHE[token] = user
+    return dict(user)
 
 
-def get_current_admin(request: Request):
-    user = get_current_user(request)
+async def get_current_admin(request: Request):
+    user = await get_current_user(request)
     if not (user.get("is_admin") and user.get("is_verified")):
         raise HTTPException(status_code=403, detail="Admin access required")
     return user
@@ -165,6 +342,41 @@ class SettingIn(BaseModel):
     glow_intensity: Optional[float] = 0.25
     parallax_intensity: Optional[float] = 8.0
 
+# Validators built once at import for the hottest POST bodies; those handlers
+# read the raw body themselves instead of going through FastAPI's body params.
+_CATEGORY_TA = TypeAdapter(CategoryIn)
+_PUBLIC_TESTIMONIAL_TA = TypeAdapter(PublicTestimonialIn)
+
+
+async def _parse_body(request: Request, adapter: TypeAdapter):
+    # Mirrors FastAPI's 422 for declared body params: "body"-prefixed locs and
+    # "missing" for an empty body. Not byte-identical: malformed JSON reports
+    # loc ["body"] without a position, and non-object bodies report
+    # "model_type" rather than "model_attributes_type".
+    body = await request.body()
+    if not body:
+        raise RequestValidationError(
+            ValidationError.from_exception_data(
+                "Field required", [{"type": "missing", "loc": ("body",), "input": None}]
+            ).errors()
+        )
+    try:
+        return adapter.validate_json(body)
+    except ValidationError as e:
+        raise RequestValidationError(
+            [{**err, "loc": ("body", *err["loc"])} for err in e.errors()]
+        )
+
+
+def _json_body_openapi(model) -> Dict[str, Any]:
+    # Re-declares the request body in the schema for handlers that parse it themselves
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": model.model_json_schema()}},
+        }
+    }
+
 # ---------------- Contact Model ----------------
 
 class ContactIn(BaseModel):
@@ -175,6 +387,11 @@ class ContactIn(BaseModel):
 
 # ---------------- Auth & Users ----------------
 
+# Hasher configured once at import; verify() reads the rounds embedded in each
+# stored hash, so existing passwords keep working after a rounds change.
+PBKDF2_ROUNDS = int(os.getenv("PBKDF2_ROUNDS", "20000"))
+password_hasher = pbkdf2_sha256.using(rounds=PBKDF2_ROUNDS)
+
 class SignupIn(BaseModel):
     name: str
     email: EmailStr
@@ -192,13 +409,15 @@ class UserOut(BaseModel):
     is_verified: bool
     created_at: datetime
 
-@app.post("/api/auth/signup", response_model=UserOut)
-def signup(user: SignupIn):
-    existing = get_documents("user", {"email": user.email}, limit=1)
+# UserOut documents the shape only; the handler builds the body itself so it is
+# not validated a second time as a response_model.
+@app.post("/api/auth/signup", response_model=None, responses={200: {"model": UserOut}})
+async def signup(user: SignupIn):
+    existing = await get_documents("user", {"email": user.email}, limit=1, projection={"_id": 1})
     if existing:
         raise HTTPException(status_code=400, detail="Email already registered")
     # Use PBKDF2-SHA256 to avoid bcrypt backend/version issues & 72-byte limit
-    hashed = pbkdf2_sha256.hash(user.password)
+    hashed = await asyncio.to_thread(password_hasher.hash, user.password)
     doc = {
         "name": user.name,
         "email": user.email,
@@ -207,46 +426,56 @@ def signup(user: SignupIn):
         "is_verified": False,
         "created_at": datetime.utcnow(),
     }
-    _id = create_document("user", doc)
-    return UserOut(id=_id, name=doc["name"], email=doc["email"], is_admin=False, is_verified=False, created_at=doc["created_at"])  # type: ignore
+    try:
+        _id = await create_document("user", doc)
+    except DuplicateKeyError:
+        # Lost a race with a concurrent signup (unique index on user.email)
+        raise HTTPException(status_code=400, detail="Email already registered")
+    return ORJSONResponse({
+        "id": _id,
+        "name": doc["name"],
+        "email": doc["email"],
+        "is_admin": False,
+        "is_verified": False,
+        "created_at": doc["created_at"].isoformat(),
+    })
 
 @app.post("/api/auth/login")
-def login(payload: LoginIn):
-    docs = get_documents("user", {"email": payload.email}, limit=1)
+async def login(payload: LoginIn):
+    docs = await get_documents("user", {"email": payload.email}, limit=1)
     if not docs:
         raise HTTPException(status_code=401, detail="Invalid email or password")
     user = docs[0]
-    # Verify using PBKDF2-SHA256
-    if not pbkdf2_sha256.verify(payload.password, user.get("password_hash", "")):
+    # Verify using PBKDF2-SHA256 off the event loop (CPU-bound)
+    if not await asyncio.to_thread(password_hasher.verify, payload.password, user.get("password_hash", "")):
         raise HTTPException(status_code=401, detail="Invalid email or password")
-    token = uuid.uuid4().hex
-    now = datetime.utcnow()
-    session_doc = {
-        "token": token,
-        "user_id": user["_id"],
-        "is_admin": bool(user.get("is_admin")),
-        "is_verified": bool(user.get("is_verified")),
-        "created_at": now,
-        "expires_at": now + timedelta(days=7),
-    }
-    create_document("session", session_doc)
-    safe_user = serialize(user)
-    safe_user.pop("password_hash", None)
-    return {"token": token, "user": safe_user}
+    token = _issue_token(user)
+    user.pop("password_hash", None)
+    return {"token": token, "user": user}
+
+@app.post("/api/auth/logout")
+async def logout(request: Request, claims: Dict[str, Any] = Depends(get_token_claims)):
+    # Revoked for every worker; other workers may still serve it from their
+    # 60s session cache until that entry expires.
+    await upsert_documents(
+        "revoked_token",
+        [{"jti": claims["jti"], "exp": datetime.fromtimestamp(claims["exp"], timezone.utc)}],
+        ["jti"],
+    )
+    _SESSION_CACHE.pop(_get_token_from_request(request), None)
+    return {"ok": True}
 
 @app.get("/api/auth/me")
-def me(user: Dict[str, Any] = Depends(get_current_user)):
+async def me(user: Dict[str, Any] = Depends(get_current_user)):
     return user
 
-@app.get("/api/users")
-def list_users(_: Dict[str, Any] = Depends(get_current_admin)):
-    docs = [serialize(d) for d in get_documents("user")]
-    for d in docs:
-        d.pop("password_hash", None)
-    return docs
+@app.get("/api/users", response_model=None)
+async def list_users(_: Dict[str, Any] = Depends(get_current_admin)):
+    docs = await get_documents("user", projection=NO_PASSWORD_HASH)
+    return ORJSONResponse(content=docs)
 
 @app.patch("/api/users/{doc_id}/verify-admin")
-def set_admin(doc_id: str, payload: Dict[str, Any], _: Dict[str, Any] = Depends(get_current_admin)):
+async def set_admin(doc_id: str, payload: Dict[str, Any], _: Dict[str, Any] = Depends(get_current_admin)):
     allowed: Dict[str, Any] = {}
     if "is_admin" in payload:
         allowed["is_admin"] = bool(payload["is_admin"])
@@ -254,7 +483,9 @@ def set_admin(doc_id: str, payload: Dict[str, Any], _: Dict[str, Any] = Depends(
         allowed["is_verified"] = bool(payload["is_verified"])
     if not allowed:
         raise HTTPException(status_code=400, detail="No fields to update")
-    ok = update_document("user", doc_id, allowed)
+    ok = await update_document("user", doc_id, allowed)
+    # update_document has validated the id; normalise it to the cached hex form
+    _invalidate_user_sessions(str(ObjectId(doc_id)))
     if not ok:
         raise HTTPException(status_code=404, detail="User not found or not modified")
     return {"ok": True}
@@ -262,17 +493,13 @@ def set_admin(doc_id: str, payload: Dict[str, Any], _: Dict[str, Any] = Depends(
 # ---------------- Seed (admin-only) ----------------
 
 @app.post("/api/seed")
-def seed_data(_: Dict[str, Any] = Depends(get_current_admin)):
-    existing_categories = {c.get("key"): c for c in get_documents("category")}
+async def seed_data(_: Dict[str, Any] = Depends(get_current_admin)):
     cat_items = [
       {"key": "uiux", "title": "UI/UX", "description": "Interfaces and flows"},
       {"key": "brand", "title": "Brand", "description": "Identity and guidelines"},
     ]
-    for c in cat_items:
-        if c["key"] not in existing_categories:
-            create_document("category", c)
+    await upsert_documents("category", cat_items, ["key"])
 
-    existing_clients = {c.get("name"): c for c in get_documents("client")}
     client_items = [
       {"name": "VoltPay", "category_key": "uiux", "description": "Fintech payments", "logo_url": "https://logo.clearbit.com/visa.com"},
       {"name": "BloomCo", "category_key": "brand", "description": "D2C beauty", "logo_url": "https://logo.clearbit.com/glossier.com"},
@@ -280,11 +507,8 @@ def seed_data(_: Dict[str, Any] = Depends(get_current_admin)):
       {"name": "Vitality", "category_key": "uiux", "description": "HealthTech", "logo_url": "https://logo.clearbit.com/fitbit.com"},
       {"name": "Northbeam", "category_key": "brand", "description": "SaaS analytics", "logo_url": "https://logo.clearbit.com/datadog.com"},
     ]
-    for cl in client_items:
-        if cl["name"] not in existing_clients:
-            create_document("client", cl)
+    await upsert_documents("client", client_items, ["name"])
 
-    existing_testimonials = {(t.get("name"), t.get("company")): t for t in get_documents("testimonial")}
     testimonial_items = [
       {"name": "A. Santoso", "role": "Product Manager", "company": "VoltPay", "rating": 5, "quote": "Raffi quickly translated complex requirements into clean, intuitive flows. The sprint velocity went up 20%.", "status": "approved"},
       {"name": "N. Wijaya", "role": "Marketing Lead", "company": "BloomCo", "rating": 5, "quote": "Our campaign hit record CTR thanks to a cohesive visual system and analytics-driven adjustments.", "status": "approved"},
@@ -292,58 +516,66 @@ def seed_data(_: Dict[str, Any] = Depends(get_current_admin)):
       {"name": "M. Rivera", "role": "CTO", "company": "Vitality", "rating": 5, "quote": "From idea to production in three weeks. Clear communication and thoughtful trade-offs throughout.", "status": "approved"},
       {"name": "K. Nguyen", "role": "Founder", "company": "Northbeam", "rating": 5, "quote": "The design system and motion guidelines elevated our brand and sped up feature delivery for the team.", "status": "approved"},
     ]
-    for t in testimonial_items:
-        key = (t["name"], t["company"])  # type: ignore
-        if key not in existing_testimonials:
-            create_document("testimonial", t)
+    await upsert_documents("testimonial", testimonial_items, ["name", "company"])
 
-    existing_settings = {s.get("key"): s for s in get_documents("setting")}
-    if "ui" not in existing_settings:
-        create_document("setting", {"key": "ui", "marquee_a_seconds": 30.0, "marquee_b_seconds": 28.0, "glow_intensity": 0.25, "parallax_intensity": 8.0})
+    await upsert_documents("setting", [{"key": "ui", "marquee_a_seconds": 30.0, "marquee_b_seconds": 28.0, "glow_intensity": 0.25, "parallax_intensity": 8.0}], ["key"])
 
     return {"ok": True}
 
 # ---------------- Public Read & Submit Endpoints ----------------
 
-@app.get("/api/categories")
-def list_categories():
-    docs = get_documents("category")
-    return [serialize(d) for d in docs]
+@app.get("/api/categories", response_model=None)
+async def list_categories():
+    return await stream_documents("category")
 
-@app.get("/api/clients")
-def list_clients(category_key: Optional[str] = None):
+@app.get("/api/clients", response_model=None)
+async def list_clients(category_key: Optional[str] = None):
     filt = {"category_key": category_key} if category_key else {}
-    docs = get_documents("client", filt)
-    return [serialize(d) for d in docs]
+    return await stream_documents("client", filt)
 
-@app.get("/api/projects")
-def list_projects(client_name: Optional[str] = None):
+@app.get("/api/projects", response_model=None)
+async def list_projects(client_name: Optional[str] = None):
     filt = {"client_name": client_name} if client_name else {}
-    docs = get_documents("project", filt)
-    return [serialize(d) for d in docs]
-
-@app.get("/api/testimonials")
-def list_testimonials(client_name: Optional[str] = None, include_all: bool = False, request: Request = None):
-    # Public: only show approved by default
-    filt: Dict[str, Any] = {"status": "approved"}
-    if client_name:
-        filt["company"] = client_name
+    return await stream_documents("project", filt)
 
-    # If include_all requested, verify admin
+@app.get("/api/testimonials", response_model=None)
+async def list_testimonials(client_name: Optional[str] = None, include_all: bool = False, request: Request = None):
+    # include_all is honoured for admins only; the role is read from the user
+    # record (cached for 60s), not the token claims, so demotions apply promptly
+    is_admin = False
     if include_all and request is not None:
         try:
-            user = get_current_admin(request)
-            if user:
-                filt.pop("status", None)
-        except Exception:
+            user = await get_current_user(request)
+            is_admin = bool(user.get("is_admin") and user.get("is_verified"))
+        except HTTPException:
             # ignore, remain filtered
             pass
 
-    docs = get_documents("testimonial", filt)
-    return [serialize(d) for d in docs]
-
-@app.post("/api/testimonials/submit")
-def submit_testimonial(payload: PublicTestimonialIn):
+    # Public: only show approved by default
+    filt: Dict[str, Any] = {} if is_admin else {"status": "approved"}
+    if client_name:
+        filt["company"] = client_name
+    return await stream_documents("testimonial", filt)
+
+@app.get("/api/bootstrap", response_model=None)
+async def bootstrap():
+    # Everything the landing page lists, fetched concurrently in one request
+    categories, clients, projects, testimonials = await asyncio.gather(
+        get_documents("category"),
+        get_documents("client"),
+        get_documents("project"),
+        get_documents("testimonial", {"status": "approved"}),
+    )
+    return ORJSONResponse(content={
+        "categories": categories,
+        "clients": clients,
+        "projects": projects,
+        "testimonials": testimonials,
+    })
+
+@app.post("/api/testimonials/submit", openapi_extra=_json_body_openapi(PublicTestimonialIn))
+async def submit_testimonial(request: Request):
+    payload: PublicTestimonialIn = await _parse_body(request, _PUBLIC_TESTIMONIAL_TA)
     # Clamp rating 0-5
     rating = payload.rating if payload.rating is not None else 5
     try:
@@ -359,13 +591,13 @@ def submit_testimonial(payload: PublicTestimonialIn):
         "status": "pending",
         "created_at": datetime.utcnow(),
     }
-    _id = create_document("testimonial", doc)
+    _id = await create_document("testimonial", doc)
     return {"id": _id, "status": "pending"}
 
 @app.get("/api/settings")
-def get_settings(key: str = "ui"):
-    docs = get_documents("setting", {"key": key}, limit=1)
-    return serialize(docs[0]) if docs else {"key": key}
+async def get_settings(key: str = "ui"):
+    docs = await get_documents("setting", {"key": key}, limit=1)
+    return docs[0] if docs else {"key": key}
 
 # ---------------- Contact Submission ----------------
 
@@ -401,7 +633,7 @@ def _send_email(subject: str, body: str, to_email: str) -> bool:
 
 
 @app.post("/api/contact")
-def submit_contact(payload: ContactIn):
+async def submit_contact(payload: ContactIn):
     cat = (payload.category or '').strip().lower()
     to_email = PHOTOGRAPHY_EMAIL if cat == 'photography' else DEFAULT_CONTACT_EMAIL
 
@@ -415,7 +647,7 @@ def submit_contact(payload: ContactIn):
         "created_at": datetime.utcnow(),
         "emailed": False,
     }
-    _id = create_document("contact", doc)
+    _id = await create_document("contact", doc)
 
     # Attempt email
     subject = f"New contact via portfolio • {payload.category.title()}"
@@ -427,93 +659,101 @@ def submit_contact(payload: ContactIn):
         f"Message:\n{payload.message}\n"
         f"\nID: {_id}\nTime: {datetime.utcnow().isoformat()}Z\n"
     )
-    emailed = _send_email(subject, body, to_email)
+    emailed = await asyncio.to_thread(_send_email, subject, body, to_email)
     if emailed:
-        update_document("contact", _id, {"emailed": True, "emailed_at": datetime.utcnow()})
+        await update_document("contact", _id, {"emailed": True, "emailed_at": datetime.utcnow()})
 
     return {"ok": True, "id": _id, "emailed": emailed}
 
 # ---------------- Admin Mutations (protected) ----------------
 
-@app.post("/api/categories")
-def create_category(payload: CategoryIn, _: Dict[str, Any] = Depends(get_current_admin)):
-    _id = create_document("category", payload.model_dump())
+@app.post("/api/categories", openapi_extra=_json_body_openapi(CategoryIn))
+async def create_category(request: Request, _: Dict[str, Any] = Depends(get_current_admin)):
+    payload: CategoryIn = await _parse_body(request, _CATEGORY_TA)
+    _id = await create_document("category", payload.model_dump())
     return {"id": _id}
 
 @app.post("/api/clients")
-def create_client(payload: ClientIn, _: Dict[str, Any] = Depends(get_current_admin)):
-    _id = create_document("client", payload.model_dump())
+async def create_client(payload: ClientIn, _: Dict[str, Any] = Depends(get_current_admin)):
+    _id = await create_document("client", payload.model_dump())
     return {"id": _id}
 
 @app.post("/api/projects")
-def create_project(payload: ProjectIn, _: Dict[str, Any] = Depends(get_current_admin)):
-    _id = create_document("project", payload.model_dump())
+async def create_project(payload: ProjectIn, _: Dict[str, Any] = Depends(get_current_admin)):
+    _id = await create_document("project", payload.model_dump())
     return {"id": _id}
 
 @app.post("/api/testimonials")
-def create_testimonial(payload: TestimonialIn, _: Dict[str, Any] = Depends(get_current_admin)):
+async def create_testimonial(payload: TestimonialIn, _: Dict[str, Any] = Depends(get_current_admin)):
     data = payload.model_dump()
     if not data.get("status"):
         data["status"] = "approved"  # admin-created are approved by default
-    _id = create_document("testimonial", data)
+    _id = await create_document("testimonial", data)
     return {"id": _id}
 
 @app.post("/api/settings")
-def create_setting(payload: SettingIn, _: Dict[str, Any] = Depends(get_current_admin)):
-    _id = create_document("setting", payload.model_dump())
+async def create_setting(payload: SettingIn, _: Dict[str, Any] = Depends(get_current_admin)):
+    try:
+        _id = await create_document("setting", payload.model_dump())
+    except DuplicateKeyError:
+        raise HTTPException(status_code=409, detail="Setting key already exists")
     return {"id": _id}
 
 @app.patch("/api/categories/{doc_id}")
-def update_category(doc_id: str, payload: Dict[str, Any], _: Dict[str, Any] = Depends(get_current_admin)):
-    if not update_document("category", doc_id, payload):
+async def update_category(doc_id: str, payload: Dict[str, Any], _: Dict[str, Any] = Depends(get_current_admin)):
+    if not await update_document("category", doc_id, payload):
         raise HTTPException(status_code=404, detail="Category not found or not modified")
     return {"ok": True}
 
 @app.patch("/api/clients/{doc_id}")
-def update_client(doc_id: str, payload: Dict[str, Any], _: Dict[str, Any] = Depends(get_current_admin)):
-    if not update_document("client", doc_id, payload):
+async def update_client(doc_id: str, payload: Dict[str, Any], _: Dict[str, Any] = Depends(get_current_admin)):
+    if not await update_document("client", doc_id, payload):
         raise HTTPException(status_code=404, detail="Client not found or not modified")
     return {"ok": True}
 
 @app.patch("/api/projects/{doc_id}")
-def update_project(doc_id: str, payload: Dict[str, Any], _: Dict[str, Any] = Depends(get_current_admin)):
-    if not update_document("project", doc_id, payload):
+async def update_project(doc_id: str, payload: Dict[str, Any], _: Dict[str, Any] = Depends(get_current_admin)):
+    if not await update_document("project", doc_id, payload):
         raise HTTPException(status_code=404, detail="Project not found or not modified")
     return {"ok": True}
 
 @app.patch("/api/testimonials/{doc_id}")
-def update_testimonial(doc_id: str, payload: Dict[str, Any], _: Dict[str, Any] = Depends(get_current_admin)):
-    if not update_document("testimonial", doc_id, payload):
+async def update_testimonial(doc_id: str, payload: Dict[str, Any], _: Dict[str, Any] = Depends(get_current_admin)):
+    if not await update_document("testimonial", doc_id, payload):
         raise HTTPException(status_code=404, detail="Testimonial not found or not modified")
     return {"ok": True}
 
 @app.patch("/api/settings/{doc_id}")
-def update_setting(doc_id: str, payload: Dict[str, Any], _: Dict[str, Any] = Depends(get_current_admin)):
-    if not update_document("setting", doc_id, payload):
+async def update_setting(doc_id: str, payload: Dict[str, Any], _: Dict[str, Any] = Depends(get_current_admin)):
+    try:
+        updated = await update_document("setting", doc_id, payload)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=409, detail="Setting key already exists")
+    if not updated:
         raise HTTPException(status_code=404, detail="Setting not found or not modified")
     return {"ok": True}
 
 @app.delete("/api/categories/{doc_id}")
-def delete_category(doc_id: str, _: Dict[str, Any] = Depends(get_current_admin)):
-    if not delete_document("category", doc_id):
+async def delete_category(doc_id: str, _: Dict[str, Any] = Depends(get_current_admin)):
+    if not await delete_document("category", doc_id):
         raise HTTPException(status_code=404, detail="Category not found")
     return {"ok": True}
 
 @app.delete("/api/clients/{doc_id}")
-def delete_client(doc_id: str, _: Dict[str, Any] = Depends(get_current_admin)):
-    if not delete_document("client", doc_id):
+async def delete_client(doc_id: str, _: Dict[str, Any] = Depends(get_current_admin)):
+    if not await delete_document("client", doc_id):
         raise HTTPException(status_code=404, detail="Client not found")
     return {"ok": True}
 
 @app.delete("/api/projects/{doc_id}")
-def delete_project(doc_id: str, _: Dict[str, Any] = Depends(get_current_admin)):
-    if not delete_document("project", doc_id):
+async def delete_project(doc_id: str, _: Dict[str, Any] = Depends(get_current_admin)):
+    if not await delete_document("project", doc_id):
         raise HTTPException(status_code=404, detail="Project not found")
     return {"ok": True}
 
 @app.delete("/api/testimonials/{doc_id}")
-def delete_testimonial(doc_id: str, _: Dict[str, Any] = Depends(get_current_admin)):
-    if not delete_document("testimonial", doc_id):
+async def delete_testimonial(doc_id: str, _: Dict[str, Any] = Depends(get_current_admin)):
+    if not await delete_document("testimonial", doc_id):
         raise HTTPException(status_code=404, detail="Testimonial not found")
     return {"ok": True}
 
@@ -579,8 +819,23 @@ def get_resume(_: Dict[str, Any] = Depends(get_current_admin)):
 
 # ---------------- Diagnostics ----------------
 
-@app.get("/test")
-def test_database():
+ENABLE_DIAG = os.getenv("ENABLE_DIAG", "").strip().lower() in ("1", "true", "yes")
+# listCollections is an admin command; the answer rarely changes
+_COLLECTIONS_CACHE: TTLCache = TTLCache(maxsize=1, ttl=30)
+
+
+async def _list_collection_names():
+    names = _COLLECTIONS_CACHE.get("names")
+    if names is None:
+        names = await db.list_collection_names()
+        _COLLECTIONS_CACHE["names"] = names
+    return names
+
+
+@app.get("/test", include_in_schema=False)
+async def test_database():
+    if not ENABLE_DIAG:
+        raise HTTPException(status_code=404, detail="Not Found")
     response = {
         "backend": "✅ Running",
         "database": "❌ Not Available",
@@ -597,7 +852,7 @@ def test_database():
             response["database_name"] = db.name if hasattr(db, 'name') else "✅ Connected"
             response["connection_status"] = "Connected"
             try:
-                collections = db.list_collection_names()
+                collections = await _list_collection_names()
                 response["collections"] = collections[:10]
                 response["database"] = "✅ Connected & Working"
             except Exception as e:
@@ -614,4 +869,14 @@ def test_database():
 if __name__ == "__main__":
     import uvicorn
     port = int(os.getenv("PORT", 8000))
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    # Multiple workers require the import string rather than the app object
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=port,
+        workers=int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1)),
+        loop="uvloop",
+        http="httptools",
+        log_level="warning",
+        access_log=False,
+    )
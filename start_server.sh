@@ -14,6 +14,9 @@ fi
 mkdir -p logs
 echo "Installing dependencies..."
 pip install -r requirements.txt
+if [ -z "$JWT_SECRET" ] && ! grep -qs '^JWT_SECRET=' .env; then
+  echo "Warning: JWT_SECRET is not set; login and authenticated routes will fail"
+fi
 echo "Starting FastAPI server..."
 nohup uvicorn main:app --host 0.0.0.0 --port 8000 --reload > logs/server.log 2>&1 
 echo "Server started in background"